@@ -2,7 +2,8 @@
 """Run tests and collect coverage & quality metrics for the codebase project.
 
 Generates/updates:
- - codebase/coverage-history.json (append entry)
+ - codebase/coverage-history.jsonl (one JSON entry appended per run; a legacy
+   coverage-history.json array is migrated on first use)
  - codebase/coverage-dashboard.md (summary table)
 
 Metrics captured per run:
@@ -13,28 +14,51 @@ Metrics captured per run:
  - uncovered_methods count
 """
 from __future__ import annotations
-import subprocess, json, re, datetime
+import argparse, subprocess, json, re, datetime, os
 from pathlib import Path
 import shutil, sys
+from collections import deque
+
+from optional_deps import dumps as _dumps
 
 ROOT = Path(__file__).resolve().parent.parent
 CODEBASE = ROOT / 'codebase'
-HISTORY = CODEBASE / 'coverage-history.json'
+HISTORY = CODEBASE / 'coverage-history.jsonl'
+LEGACY_HISTORY = CODEBASE / 'coverage-history.json'
 DASHBOARD = CODEBASE / 'coverage-dashboard.md'
 
 PARSE_JACOCO = ROOT / '.mcp' / 'parse_jacoco.py'
+# Per-file assert counts keyed by path -> [mtime_ns, size, count]; only used
+# by the pure-Python fallback in count_assertions.
+ASSERT_CACHE = ROOT / '.mcp' / '.assert_cache.json'
+
+# Surefire summary line pattern: Tests run: 2300, Failures: 34, Errors: 14, Skipped: 4
+_SUREFIRE_RE = re.compile(r'Tests run:\s*(\d+),\s*Failures:\s*(\d+),\s*Errors:\s*(\d+),\s*Skipped:\s*(\d+)')
+# Lines of Maven output kept for error context.
+_TAIL_LINES = 200
 
 def run_maven_tests():
     mvn = shutil.which('mvn') or shutil.which('mvn.cmd') or 'mvn'
-    cmd = [mvn, '-f', str(CODEBASE / 'pom.xml'), '-U', 'test']
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    return proc.returncode, proc.stdout + proc.stderr
-
-def extract_surefire_stats(output: str):
-    # Surefire summary line pattern: Tests run: 2300, Failures: 34, Errors: 14, Skipped: 4
-    m = re.search(r'Tests run:\s*(\d+),\s*Failures:\s*(\d+),\s*Errors:\s*(\d+),\s*Skipped:\s*(\d+)', output)
-    if not m:
-        return None
+    # Parallel build: one thread per core by default (override via MVN_THREADS).
+    # Plugins bound to the build must be thread-safe (<threadSafe>true</threadSafe>).
+    threads = os.environ.get('MVN_THREADS', '1C')
+    cmd = [mvn, '-T', threads, '-f', str(CODEBASE / 'pom.xml'), '-U',
+           '-DforkCount=1C', '-DreuseForks=true', 'test']
+    # Stream the log instead of buffering it: match each line as it arrives
+    # (the last summary wins) and keep only a short tail for diagnostics.
+    stats = None
+    tail = deque(maxlen=_TAIL_LINES)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1)
+    with proc.stdout:
+        for line in proc.stdout:
+            tail.append(line)
+            m = _SUREFIRE_RE.search(line)
+            if m:
+                stats = _stats_from_match(m)
+    return proc.wait(), stats, ''.join(tail)
+
+def _stats_from_match(m):
     return {
         'total_tests': int(m.group(1)),
         'failures': int(m.group(2)),
@@ -42,14 +66,59 @@ def extract_surefire_stats(output: str):
         'skipped': int(m.group(4)),
     }
 
+def _scan_java(root):
+    """Yield os.DirEntry objects for every .java file below root."""
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.java'):
+                    yield entry
+
 def count_assertions():
+    test_dir = CODEBASE / 'src' / 'test' / 'java'
+    # Prefer a single literal-search subprocess over reading every file in Python.
+    rg = shutil.which('rg')
+    if rg:
+        cmd = [rg, '-F', '--count-matches', '--no-filename', '--no-ignore',
+               '--glob', '*.java', 'assert', str(test_dir)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode in (0, 1):
+            return sum(int(n) for n in proc.stdout.split())
+    # Otherwise re-read only the test files whose mtime/size changed since the last run.
+    try:
+        cache = json.loads(ASSERT_CACHE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        cache = {}
+    fresh = {}
     count = 0
-    for p in (CODEBASE / 'src' / 'test' / 'java').rglob('*.java'):
+    for entry in _scan_java(test_dir):
         try:
-            txt = p.read_text(encoding='ISO-8859-1', errors='ignore')
-        except Exception:
+            st = entry.stat()
+        except OSError:
             continue
-        count += txt.count('assert')
+        hit = cache.get(entry.path)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            n = hit[2]
+        else:
+            try:
+                txt = Path(entry.path).read_text(encoding='ISO-8859-1', errors='ignore')
+            except Exception:
+                continue
+            n = txt.count('assert')
+        fresh[entry.path] = [st.st_mtime_ns, st.st_size, n]
+        count += n
+    if fresh != cache:
+        try:
+            ASSERT_CACHE.write_text(_dumps(fresh), encoding='utf-8')
+        except OSError:
+            pass
     return count
 
 def parse_jacoco():
@@ -72,44 +141,125 @@ def parse_jacoco():
         'uncovered_methods': uncovered_count,
     }
 
+def _migrate_legacy_history():
+    if HISTORY.exists() or not LEGACY_HISTORY.exists():
+        return
+    try:
+        legacy = json.loads(LEGACY_HISTORY.read_text(encoding='utf-8'))
+    except Exception:
+        return
+    if isinstance(legacy, list):
+        with HISTORY.open('w', encoding='utf-8') as fh:
+            for entry in legacy:
+                fh.write(_dumps(entry) + '\n')
+
 def load_history():
-    if HISTORY.exists():
-        try:
-            return json.loads(HISTORY.read_text(encoding='utf-8'))
-        except Exception:
-            return []
-    return []
+    _migrate_legacy_history()
+    if not HISTORY.exists():
+        return []
+    history = []
+    with HISTORY.open(encoding='utf-8') as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                history.append(json.loads(line))
+            except ValueError:
+                continue
+    return history
+
+def append_history(entry):
+    _migrate_legacy_history()
+    with HISTORY.open('a', encoding='utf-8') as fh:
+        fh.write(_dumps(entry) + '\n')
 
-def save_history(data):
-    HISTORY.write_text(json.dumps(data, indent=2), encoding='utf-8')
+DASHBOARD_HEADER = ["# Coverage & Quality Dashboard", '',
+                    '| Run | Timestamp | Tests | Fail | Err | Skip | Assertions | Uncovered Methods |',
+                    '| --- | --------- | ----- | ---- | --- | ---- | ---------- | ----------------- |']
+
+def _dashboard_row(i, entry):
+    return (f"| {i} | {entry['timestamp']} | {entry.get('total_tests','')} | {entry.get('failures','')} | "
+            f"{entry.get('errors','')} | {entry.get('skipped','')} | {entry.get('assertions_estimate','')} | "
+            f"{entry.get('uncovered_methods','')} |")
 
 def render_dashboard(history):
-    lines = ["# Coverage & Quality Dashboard", '',
-             '| Run | Timestamp | Tests | Fail | Err | Skip | Assertions | Uncovered Methods |',
-             '| --- | --------- | ----- | ---- | --- | ---- | ---------- | ----------------- |']
+    lines = list(DASHBOARD_HEADER)
     for i, entry in enumerate(history, 1):
-        lines.append(f"| {i} | {entry['timestamp']} | {entry.get('total_tests','')} | {entry.get('failures','')} | "
-                     f"{entry.get('errors','')} | {entry.get('skipped','')} | {entry.get('assertions_estimate','')} | "
-                     f"{entry.get('uncovered_methods','')} |")
+        lines.append(_dashboard_row(i, entry))
     DASHBOARD.write_text('\n'.join(lines) + '\n', encoding='utf-8')
 
-def main():
-    rc, output = run_maven_tests()
-    stats = extract_surefire_stats(output) or {}
+def _last_line(path, block=4096):
+    """Last non-blank line of a file, read backwards from the end."""
+    with path.open('rb') as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        data = b''
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            fh.seek(pos)
+            data = fh.read(step) + data
+            tail = data.rstrip()
+            nl = tail.rfind(b'\n')
+            if nl >= 0 or pos == 0:
+                return tail[nl + 1:].decode('utf-8', 'replace')
+    return ''
+
+def _last_history_entry():
+    try:
+        return json.loads(_last_line(HISTORY))
+    except (OSError, ValueError):
+        return None
+
+def _last_dashboard_row():
+    """(run number, timestamp) of the dashboard's last row, or None."""
+    try:
+        cells = [c.strip() for c in _last_line(DASHBOARD).split('|')]
+    except OSError:
+        return None
+    if len(cells) < 3 or not cells[1].isdigit():
+        return None
+    return int(cells[1]), cells[2]
+
+def append_dashboard_row(previous, entry):
+    # Rows are append-only like the history. The next run number follows the
+    # dashboard's last row, which is only trusted if it shows the entry that
+    # was last in the history before this run; otherwise re-render from history.
+    row = _last_dashboard_row()
+    if previous is None or row is None or row[1] != str(previous.get('timestamp')):
+        render_dashboard(load_history())
+        return
+    with DASHBOARD.open('a', encoding='utf-8') as fh:
+        fh.write(_dashboard_row(row[0] + 1, entry) + '\n')
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Run tests and record coverage & quality metrics.')
+    p.add_argument('--rebuild', action='store_true', help='Re-render the whole dashboard from history')
+    args = p.parse_args(argv)
+
+    rc, stats, tail = run_maven_tests()
+    stats = stats or {}
+    if rc != 0:
+        sys.stderr.write(tail)
     assertions = count_assertions()
     jacoco = parse_jacoco() or {}
+    # timezone-aware UTC; utcnow() is deprecated since Python 3.12
+    now_iso = datetime.datetime.now(datetime.timezone.utc).isoformat()
     entry = {
-        'timestamp': datetime.datetime.utcnow().isoformat(),
+        'timestamp': now_iso,
         **stats,
         'assertions_estimate': assertions,
         **jacoco,
         'build_success': rc == 0,
     }
-    history = load_history()
-    history.append(entry)
-    save_history(history)
-    render_dashboard(history)
-    print(json.dumps(entry, indent=2))
+    # A history created or migrated by this run has no rows on the dashboard yet
+    fresh = not HISTORY.exists()
+    previous = None if fresh else _last_history_entry()
+    append_history(entry)
+    if args.rebuild or fresh:
+        render_dashboard(load_history())
+    else:
+        append_dashboard_row(previous, entry)
+    print(_dumps(entry, pretty=True))
     return 0 if rc == 0 else 1
 
 if __name__ == '__main__':
@@ -9,18 +9,26 @@ summary to `.mcp/ai_review_report.json` and prints a human-readable summary to s
 The script is intentionally conservative: it detects installed tools and runs them
 via Maven goals where possible to avoid modifying the build.
 """
-import json
 import os
 import shlex
 import shutil
 import subprocess
 import sys
-from xml.etree import ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from optional_deps import ET, XML_PARSER as _XML_PARSER, dumps as _dumps
 
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 REPORT_PATH = os.path.join(os.path.dirname(__file__), 'ai_review_report.json')
+# Every Maven call shares one local repository so artifacts resolve once.
+# Checks run concurrently; file-lock sync keeps parallel Maven processes from
+# corrupting it.
+M2_REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.m2')
+# Files per google-java-format call when xargs isn't available.
+GJF_BATCH = 500
 
 
 def run(cmd, cwd=ROOT, capture=True):
@@ -36,14 +44,37 @@ def run(cmd, cwd=ROOT, capture=True):
         return 127, ''
 
 
+@lru_cache(maxsize=None)
+def _which(name):
+    # PATH doesn't change during a run; resolve each tool once
+    return shutil.which(name)
+
+
 def detect_tool(name):
-    return shutil.which(name) is not None
+    return _which(name) is not None
+
+
+# Set once `package` has succeeded so later checks don't rebuild target/classes.
+_PROJECT_COMPILED = False
+
+
+@lru_cache(maxsize=None)
+def _maven():
+    # The Maven daemon keeps a warm JVM between calls; fall back to plain mvn.
+    # MVN_OFFLINE=1 skips remote checks once the shared repo is populated.
+    cmd = ['mvnd' if detect_tool('mvnd') else 'mvn',
+           f'-Dmaven.repo.local={M2_REPO}',
+           '-Daether.syncContext.named.factory=file-lock']
+    if os.environ.get('MVN_OFFLINE') == '1':
+        cmd.append('-o')
+    return shlex.join(cmd)
 
 
 def run_spotbugs():
     # Try Maven plugin first (will download plugin if needed). If the plugin
     # resolution fails, prefer the SpotBugs CLI if it's installed locally.
-    code, out = run('mvn -q com.github.spotbugs:spotbugs-maven-plugin:4.7.3:spotbugs')
+    global _PROJECT_COMPILED
+    code, out = run(f'{_maven()} -q com.github.spotbugs:spotbugs-maven-plugin:4.7.3:spotbugs')
     result = {'name': 'spotbugs', 'exit_code': code, 'output_snippet': out[:2000]}
     if code == 0:
         return result
@@ -51,7 +82,9 @@ def run_spotbugs():
     # Maven plugin failed. If SpotBugs CLI is available, run it against compiled classes.
     if detect_tool('spotbugs'):
         # Ensure project is compiled so target/classes exists.
-        run('mvn -q -DskipTests package', capture=True)
+        if not _PROJECT_COMPILED:
+            pkg_code, _ = run(f'{_maven()} -q -DskipTests package', capture=True)
+            _PROJECT_COMPILED = pkg_code == 0
         cli_cmd = 'spotbugs -textui -effort:max -low -xml:withMessages -output target/spotbugsXml.xml target/classes'
         cli_code, cli_out = run(cli_cmd)
         # attach CLI info to the result and parse the XML report if present
@@ -66,7 +99,7 @@ def run_spotbugs():
         # Parse report for counts and sample issues
         if os.path.exists(report_path):
             try:
-                tree = ET.parse(report_path)
+                tree = ET.parse(report_path, _XML_PARSER)
                 root = tree.getroot()
                 # Count BugInstance nodes
                 bug_instances = root.findall('.//BugInstance')
@@ -101,17 +134,39 @@ def run_spotbugs():
 
 
 def run_pmd():
-    code, out = run('mvn -q pmd:pmd')
+    code, out = run(f'{_maven()} -q pmd:pmd')
     return {'name': 'pmd', 'exit_code': code, 'output_snippet': out[:2000]}
 
 
 def run_google_java_format(apply_fixes=False):
     # If google-java-format is installed, run it. Prefer --dry-run unless apply_fixes True.
-    gjf = shutil.which('google-java-format')
+    gjf = _which('google-java-format')
     if not gjf:
         return {'name': 'google-java-format', 'present': False}
-    cmd = f"google-java-format {'-n' if not apply_fixes else '-i'} --replace $(git ls-files '*.java')"
-    code, out = run(cmd, capture=True)
+    mode = '--replace' if apply_fixes else '--dry-run'
+    # Stream NUL-separated filenames from git into the formatter rather than
+    # expanding them onto one command line (which shlex can't do anyway).
+    print(f"Running: git ls-files -z '*.java' | xargs -0 google-java-format {mode}")
+    try:
+        lister = subprocess.Popen(['git', 'ls-files', '-z', '*.java'], cwd=ROOT, stdout=subprocess.PIPE)
+    except FileNotFoundError:
+        return {'name': 'google-java-format', 'present': True, 'exit_code': 127, 'output_snippet': ''}
+    if _which('xargs'):
+        fmt = subprocess.Popen(['xargs', '-0', '-r', gjf, mode], cwd=ROOT, stdin=lister.stdout,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        lister.stdout.close()
+        out, _ = fmt.communicate()
+        lister.wait()
+        code = fmt.returncode
+    else:
+        files = [f for f in lister.communicate()[0].decode('utf-8', 'replace').split('\0') if f]
+        code, chunks = 0, []
+        for i in range(0, len(files), GJF_BATCH):
+            proc = subprocess.run([gjf, mode, *files[i:i + GJF_BATCH]], cwd=ROOT,
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            code = code or proc.returncode
+            chunks.append(proc.stdout)
+        out = ''.join(chunks)
     return {'name': 'google-java-format', 'present': True, 'exit_code': code, 'output_snippet': out[:2000]}
 
 
@@ -127,11 +182,12 @@ def run_codeql():
     return {'name': 'codeql', 'present': True, 'note': 'CodeQL CLI present; full scan skipped (run in CI for full results)'}
 
 
-def summarize(results):
-    now = datetime.now().isoformat()
+def summarize(results, now=None):
+    now = now or datetime.now(timezone.utc).isoformat()
     summary = {'timestamp': now, 'results': results}
     with open(REPORT_PATH, 'w') as f:
-        json.dump(summary, f, indent=2)
+        # human-facing report: keep it indented
+        f.write(_dumps(summary, pretty=True))
     print('\nAI Code Review summary saved to', REPORT_PATH)
     # Print concise human summary
     for r in results:
@@ -147,30 +203,25 @@ def summarize(results):
                 print(f"- {name}: {status}")
 
 
-def main():
-    results = []
-
-    # SpotBugs
-    print('== SpotBugs ==')
-    sb = run_spotbugs()
-    results.append(sb)
+CHECKS = (
+    ('SpotBugs', run_spotbugs),
+    ('PMD', run_pmd),
+    ('google-java-format (dry-run)', lambda: run_google_java_format(apply_fixes=False)),
+    ('CodeQL detection', run_codeql),
+)
 
-    # PMD
-    print('\n== PMD ==')
-    pmd = run_pmd()
-    results.append(pmd)
 
-    # google-java-format (dry-run)
-    print('\n== google-java-format (dry-run) ==')
-    gjf = run_google_java_format(apply_fixes=False)
-    results.append(gjf)
-
-    # CodeQL
-    print('\n== CodeQL detection ==')
-    codeql = run_codeql()
-    results.append(codeql)
-
-    summarize(results)
+def main():
+    started = datetime.now(timezone.utc).isoformat()
+    # The checks are independent and each blocks on its own subprocess, so run
+    # them side by side; results keep the declaration order.
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as executor:
+        futures = {executor.submit(check): label for label, check in CHECKS}
+        for future in as_completed(futures):
+            print(f'== {futures[future]} finished ==')
+        results = [future.result() for future in futures]
+
+    summarize(results, started)
 
 
 if __name__ == '__main__':
@@ -6,11 +6,13 @@ Supports a --json flag to emit machine-readable JSON suitable for redirecting in
 `coverage.json` in CI (e.g., `.mcp/coverage_analyzer.py --json > coverage.json`).
 """
 import argparse
-import json
-import xml.etree.ElementTree as ET
+import sys
+from array import array
 from pathlib import Path
 from datetime import datetime
 
+from optional_deps import ET, ITERPARSE_KW as _ITERPARSE_KW, dumps as _dumps
+
 
 def find_jacoco_xml() -> Path | None:
     """Locate a JaCoCo XML report among common Maven paths.
@@ -30,35 +32,96 @@ def find_jacoco_xml() -> Path | None:
     return None
 
 
+class UncoveredMethods:
+    """Method-level counters with missed > 0, stored column-wise.
+
+    Counts live in two int arrays and names in parallel lists, so a large
+    report costs one slot per field instead of one dict per entry. Use
+    `rows()` for tuples or `to_dicts()` for the JSON shape.
+    """
+
+    FIELDS = ('package', 'class', 'method', 'type', 'missed', 'covered')
+
+    def __init__(self):
+        self.package = []
+        self.cls = []
+        self.method = []
+        self.type = []
+        self.missed = array('i')
+        self.covered = array('i')
+
+    def append(self, package, cls, method, ctype, missed, covered):
+        self.package.append(package)
+        self.cls.append(cls)
+        self.method.append(method)
+        self.type.append(ctype)
+        self.missed.append(missed)
+        self.covered.append(covered)
+
+    def __len__(self):
+        return len(self.missed)
+
+    def rows(self):
+        return zip(self.package, self.cls, self.method, self.type, self.missed, self.covered)
+
+    def to_dicts(self):
+        return [dict(zip(self.FIELDS, row)) for row in self.rows()]
+
+
 def parse_jacoco(xml_path: Path):
-    """Return a tuple (coverage_dict, uncovered_methods_list).
+    """Return a tuple (coverage_dict, uncovered_methods).
 
     coverage_dict maps counter types (LINE, INSTRUCTION, BRANCH) to a dict with
     missed and covered counts and percentage.
-    uncovered_methods_list is a list of dicts with pkg, class, method, type, missed, covered.
+    uncovered_methods is an UncoveredMethods holding pkg, class, method, type,
+    missed, covered for every method counter with missed > 0.
     """
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    # collect report-level counters first
+    # Stream the report so only the class currently being read is held in
+    # memory; `path` tracks the open element tags to locate each counter.
     counters = {}
-    for counter in root.findall('counter'):
-        ctype = counter.get('type')
-        missed = int(counter.get('missed'))
-        covered = int(counter.get('covered'))
-        counters[ctype] = {'missed': missed, 'covered': covered}
+    package_counters = {}
+    uncovered = UncoveredMethods()
+    path = []
+    root = None
+    pkg_name = cls_name = mname = None
+    for event, elem in ET.iterparse(str(xml_path), events=('start', 'end'), **_ITERPARSE_KW):
+        tag = elem.tag
+        if event == 'start':
+            if root is None:
+                root = elem
+            path.append(tag)
+            scope = path[1:]
+            if scope == ['package']:
+                pkg_name = elem.get('name')
+            elif scope == ['package', 'class']:
+                cls_name = elem.get('name')
+            elif scope == ['package', 'class', 'method']:
+                mname = elem.get('name')
+            continue
+
+        path.pop()
+        if tag == 'counter':
+            parent = path[1:]
+            ctype = elem.get('type')
+            missed = int(elem.get('missed'))
+            covered = int(elem.get('covered'))
+            if not parent:
+                # report-level counters
+                counters[ctype] = {'missed': missed, 'covered': covered}
+            elif parent == ['package']:
+                vals = package_counters.setdefault(ctype, {'missed': 0, 'covered': 0})
+                vals['missed'] += missed
+                vals['covered'] += covered
+            elif parent == ['package', 'class', 'method'] and missed > 0:
+                uncovered.append(pkg_name, cls_name, mname, ctype, missed, covered)
+        elif tag in ('class', 'sourcefile'):
+            elem.clear()
+        elif tag == 'package' and root is not None:
+            root.clear()
 
     # fallback: if report-level counters missing, aggregate from packages
     if not counters:
-        for package in root.findall('package'):
-            for counter in package.findall('counter'):
-                ctype = counter.get('type')
-                missed = int(counter.get('missed'))
-                covered = int(counter.get('covered'))
-                if ctype not in counters:
-                    counters[ctype] = {'missed': 0, 'covered': 0}
-                counters[ctype]['missed'] += missed
-                counters[ctype]['covered'] += covered
+        counters = package_counters
 
     # compute percentages
     coverage = {}
@@ -71,37 +134,23 @@ def parse_jacoco(xml_path: Path):
             'percent': round(pct, 2),
         }
 
-    # find uncovered methods
-    uncovered = []
-    for package in root.findall('package'):
-        pkg_name = package.get('name')
-        for cls in package.findall('class'):
-            cls_name = cls.get('name')
-            for m in cls.findall('method'):
-                mname = m.get('name')
-                for counter in m.findall('counter'):
-                    ctype = counter.get('type')
-                    missed = int(counter.get('missed'))
-                    covered = int(counter.get('covered'))
-                    if missed > 0:
-                        uncovered.append({
-                            'package': pkg_name,
-                            'class': cls_name,
-                            'method': mname,
-                            'type': ctype,
-                            'missed': missed,
-                            'covered': covered,
-                        })
-
     return coverage, uncovered
 
 
+RECOMMENDATIONS = (
+    "\nRecommendations:",
+    " - Add focused unit tests that call these methods with representative inputs.",
+    " - For branches, add tests that exercise both true/false paths.",
+    " - If methods are hard to test, consider extracting logic to smaller testable units.",
+)
+
+
 def analyze(json_out: bool = False):
     xml_path = find_jacoco_xml()
     if not xml_path:
         msg = "JaCoCo XML not found in common locations. Run `mvn verify` or `mvn test` to generate it."
         if json_out:
-            print(json.dumps({'error': msg}))
+            print(_dumps({'error': msg}))
             return 1
         print(msg)
         return 1
@@ -122,9 +171,10 @@ def analyze(json_out: bool = False):
             'coverage_pct': overall,
             'coverage': {k: v['percent'] for k, v in coverage.items()},
             'coverage_detail': coverage,
-            'uncovered': uncovered,
+            'uncovered': uncovered.to_dicts(),
         }
-        print(json.dumps(payload, indent=2))
+        # machine-readable (CI redirects it into coverage.json): no indentation
+        print(_dumps(payload))
         return 0
 
     # human-friendly output
@@ -137,13 +187,12 @@ def analyze(json_out: bool = False):
                 print(f" - {k}: {v['percent']}% ({v['covered']}/{v['missed'] + v['covered']})")
         return 0
 
-    print("Uncovered code segments (method-level):")
-    for e in uncovered:
-        print(f" - {e['package']}.{e['class']}#{e['method']} : {e['type']} missed={e['missed']} covered={e['covered']}")
-    print("\nRecommendations:")
-    print(" - Add focused unit tests that call these methods with representative inputs.")
-    print(" - For branches, add tests that exercise both true/false paths.")
-    print(" - If methods are hard to test, consider extracting logic to smaller testable units.")
+    # one write for the whole listing instead of a print per method
+    lines = ["Uncovered code segments (method-level):"]
+    lines.extend(f" - {pkg}.{cls}#{mname} : {ctype} missed={missed} covered={covered}"
+                 for pkg, cls, mname, ctype, missed, covered in uncovered.rows())
+    lines.extend(RECOMMENDATIONS)
+    sys.stdout.write('\n'.join(lines) + '\n')
     return 0
 
 
@@ -2,49 +2,60 @@
 """
 Simple MCP-style tool: scan Java sources in src/main/java and generate JUnit5 test stubs
 into src/test/java. This is naive but suitable as a starter.
+
+Sources whose SHA-256 matches the previous run (and whose stub still exists) are
+skipped; the manifest lives in `.mcp/.gentests.cache.json`.
 """
+import hashlib
+import json
+import math
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 SRC_DIR = Path("src/main/java")
 TEST_DIR = Path("src/test/java")
+CACHE = Path(__file__).resolve().parent / ".gentests.cache.json"
 
 
 def find_java_files():
-    for root, _, files in os.walk(SRC_DIR):
-        for f in files:
-            if f.endswith('.java'):
-                yield Path(root) / f
-
-
-method_re = re.compile(r"public\s+(?:static\s+)?([\w<>\[\]]+)\s+(\w+)\s*\(([^)]*)\)")
+    # scandir-based walk: DirEntry caches the file type, so there's no second stat per entry
+    stack = [SRC_DIR]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.java'):
+                    yield Path(entry.path)
+
+
+method_re = re.compile(
+    r"^[ \t]*public\s+(?:(?:static|final|synchronized|abstract|native|default)\s+)*"
+    r"(?:<[^(){};]*>\s*)?"  # a generic method's type parameters are not part of the return type
+    r"([\w$.<>\[\]?, ]+?)\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s[^{;]*)?[{;]",
+    re.MULTILINE,
+)
 class_re = re.compile(r"public\s+class\s+(\w+)")
 
 
 def parse_methods(java_text):
-    methods = []
-    # naive line-oriented parse: find lines with 'public' and '(' and ')' and extract name
-    for line in java_text.splitlines():
-        line = line.strip()
-        if not line.startswith('public '):
-            continue
-        if '(' not in line or ')' not in line:
-            continue
-        # remove trailing throws clause and body start
-        sig = line.split('throws')[0]
-        sig = sig.split('{')[0].strip()
-        try:
-            before_paren, argstr = sig.split('(', 1)
-            argstr = argstr.rsplit(')', 1)[0]
-            parts = before_paren.split()
-            if len(parts) >= 2:
-                ret = parts[-2]
-                name = parts[-1]
-                methods.append((ret.strip(), name.strip(), argstr.strip()))
-        except Exception:
-            continue
-    return methods
+    """Return (return_type, name, args) for each public method.
+
+    >>> parse_methods("public static <L> void addListener(L l, Object o) {")
+    [('void', 'addListener', 'L l, Object o')]
+    >>> parse_methods("public static <T extends Comparable<? super T>> int compare(T a, T b) {")
+    [('int', 'compare', 'T a, T b')]
+    >>> parse_methods("public <K, V> Map<K, V> zip(List<K> k) {")
+    [('Map<K, V>', 'zip', 'List<K> k')]
+    """
+    # one pass of the compiled pattern over the whole file; signatures may span lines
+    return [(ret.strip(), name, argstr.strip()) for ret, name, argstr in method_re.findall(java_text)]
 
 
 def parse_classname(java_text):
@@ -68,7 +79,7 @@ def generate_test_for(java_path: Path):
     text = java_path.read_text()
     classname = parse_classname(text)
     if not classname:
-        return
+        return None
     methods = parse_methods(text)
     print(f"Parsed methods for {classname}: {methods}")
     # derive package path
@@ -119,13 +130,64 @@ def generate_test_for(java_path: Path):
     out.append("    }\n")
     out.append("}\n")
 
-    (test_dir / (test_classname + ".java")).write_text("\n".join(out))
+    out_path = test_dir / (test_classname + ".java")
+    # stream the chunks through one buffered handle (same layout as "\n".join(out))
+    with out_path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        f.write(out[0])
+        for chunk in out[1:]:
+            f.write("\n")
+            f.write(chunk)
     print(f"Generated {test_classname}.java in {test_dir}")
+    return str(out_path)
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    CACHE.write_text(json.dumps(cache), encoding="utf-8")
+
+
+def is_unchanged(entry, digest):
+    # entry = {"sha256": ..., "output": path-or-None}; None means no class was found
+    if not entry or entry.get("sha256") != digest:
+        return False
+    output = entry.get("output")
+    return output is None or Path(output).exists()
 
 
 def main():
+    cache = load_cache()
+    files = []
+    digests = {}
     for java in find_java_files():
-        generate_test_for(java)
+        key = str(java.resolve())
+        digest = hashlib.sha256(java.read_bytes()).hexdigest()
+        if is_unchanged(cache.get(key), digest):
+            continue
+        files.append(java)
+        digests[key] = digest
+    if not files:
+        print("All test stubs are up to date.")
+        return
+
+    if len(files) <= 1:
+        outputs = [generate_test_for(java) for java in files]
+    else:
+        # Files are independent: parse and write them across worker processes.
+        workers = os.cpu_count() or 1
+        chunksize = max(1, math.ceil(len(files) / (4 * workers)))
+        with ProcessPoolExecutor() as executor:
+            outputs = list(executor.map(generate_test_for, files, chunksize=chunksize))
+
+    for java, output in zip(files, outputs):
+        key = str(java.resolve())
+        cache[key] = {"sha256": digests[key], "output": output and str(Path(output).resolve())}
+    save_cache(cache)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,31 @@
+"""
+Optional C-accelerated dependencies shared by the .mcp scripts.
+
+orjson and lxml are used when installed; otherwise the standard library
+equivalents are used, so every script still runs on a bare interpreter.
+"""
+import json
+
+try:  # C JSON encoder when available; stdlib otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # libxml2-backed parser when available; stdlib otherwise
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    from xml.etree import ElementTree as ET
+    HAVE_LXML = False
+
+# Parser for ET.parse (None selects the stdlib default) and keyword arguments
+# for ET.iterparse; lxml refuses very large reports without huge_tree.
+XML_PARSER = ET.XMLParser(huge_tree=True, collect_ids=False) if HAVE_LXML else None
+ITERPARSE_KW = {'huge_tree': True} if HAVE_LXML else {}
+
+
+def dumps(obj, pretty=False):
+    """Serialize obj to a JSON string, indented when pretty."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
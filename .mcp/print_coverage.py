@@ -5,7 +5,8 @@ Validate and print coverage JSON files.
 Usage:
   .mcp/print_coverage.py [path] [--latest]
 
-This script defaults to `coverage.json` but will work with `coverage-history.json` (list of runs).
+This script defaults to `coverage.json` but will work with `coverage-history.json` (list of runs)
+and `coverage-history.jsonl` (one run per line).
 It prints the latest entry (if requested) and a compact coverage summary when available.
 """
 import argparse
@@ -42,7 +43,10 @@ def main():
     if path.stat().st_size == 0:
         fail(f"{path} is empty.")
     try:
-        data = json.loads(path.read_text())
+        if path.suffix == ".jsonl":
+            data = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+        else:
+            data = json.loads(path.read_text())
     except json.JSONDecodeError as e:
         fail(f"Failed to parse {path}: {e}")
 
@@ -4,15 +4,17 @@
 Reads a spec JSON path (default: .mcp/spec_calculator_add.json) and prints a
 compact JSON summary including counts, output file path, and a sample of cases.
 """
-import json, sys, runpy, pathlib
+import json, sys, pathlib
 
 def main():
     spec_path = pathlib.Path('.mcp/spec_calculator_add.json')
     if len(sys.argv) > 1:
         spec_path = pathlib.Path(sys.argv[1])
     spec = json.loads(spec_path.read_text(encoding='utf-8'))
-    mod = runpy.run_path(str(pathlib.Path('.mcp') / 'spec_test_generator.py'))
-    gen = mod['generate_and_render']
+    # A regular import reuses the cached bytecode in __pycache__
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+    import spec_test_generator as mod
+    gen = mod.generate_and_render
     res = gen(spec, True)
     out = {
         'summary': res['summary'],
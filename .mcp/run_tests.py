@@ -1,12 +1,26 @@
 #!/usr/bin/env python3
 """
 Small helper to run Maven tests and report status. Intended to be run from project root.
+
+Usage:
+  .mcp/run_tests.py [--offline] [--threads N] [--skip-its]
 """
+import argparse
 import subprocess
 import sys
 
 def main():
-    cmd = ["mvn", "-U", "clean", "test"]
+    p = argparse.ArgumentParser(description="Run the Maven test phase.")
+    p.add_argument("--offline", action="store_true",
+                   help="Build offline (-o) instead of forcing an update check (-U); needs a warm local repo")
+    p.add_argument("--threads", default="1C", help="Maven -T value (default: 1C, one thread per core)")
+    p.add_argument("--skip-its", action="store_true", help="Pass -DskipITs to run unit tests only")
+    args = p.parse_args()
+
+    cmd = ["mvn", "-o" if args.offline else "-U", "-T", args.threads]
+    if args.skip_its:
+        cmd.append("-DskipITs")
+    cmd += ["clean", "test"]
     print("Running: ", " ".join(cmd))
     p = subprocess.run(cmd)
     sys.exit(p.returncode)
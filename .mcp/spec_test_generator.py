@@ -14,6 +14,8 @@ JUnit 4 test class written to the workspace.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import math
@@ -31,10 +33,9 @@ class ParamSpec:
 
 
 def _midpoint(min_v: int, max_v: int) -> int:
-    try:
-        return int(min_v + (max_v - min_v) // 2)
-    except Exception:
-        return min_v
+    # Python ints don't overflow and >> floors for negatives too, so this
+    # equals min_v + (max_v - min_v) // 2. Callers already pass ints.
+    return (min_v + max_v) >> 1
 
 
 def _derive_default_equivalence_classes(p: ParamSpec) -> List[Dict[str, Any]]:
@@ -56,8 +57,8 @@ def _derive_default_equivalence_classes(p: ParamSpec) -> List[Dict[str, Any]]:
         ecs.append({"name": "high", "range": [(min_v + max_v) / 2.0, max_v]})
     elif p.domain and "values" in p.domain:
         # Enumerated set
-        vals = list(p.domain["values"])[:3]
-        for i, v in enumerate(vals):
+        # only the first three values are used; don't copy the rest
+        for i, v in enumerate(islice(p.domain["values"], 3)):
             ecs.append({"name": f"value_{i}", "values": [v]})
     else:
         # Fallback nominal-only
@@ -70,14 +71,12 @@ def _derive_default_boundaries(p: ParamSpec) -> List[Any]:
     if p.type in {"int", "long", "short", "byte"} and p.domain and "min" in p.domain and "max" in p.domain:
         min_v = int(p.domain["min"])
         max_v = int(p.domain["max"])
-        candidates = [min_v, min_v + 1, max_v - 1, max_v]
-        for c in candidates:
-            if min_v <= c <= max_v and c not in b:
+        seen = set()
+        # edges first, then near zero if within domain; first occurrence wins
+        for c in (min_v, min_v + 1, max_v - 1, max_v, -1, 0, 1):
+            if min_v <= c <= max_v and c not in seen:
+                seen.add(c)
                 b.append(c)
-        # include near zero if within domain
-        for z in (-1, 0, 1):
-            if min_v <= z <= max_v and z not in b:
-                b.append(z)
     elif p.type in {"float", "double"} and p.domain and "min" in p.domain and "max" in p.domain:
         min_v = float(p.domain["min"]) 
         max_v = float(p.domain["max"]) 
@@ -125,82 +124,76 @@ def _representative_from_ec(ec: Dict[str, Any], p: ParamSpec) -> Any:
     return _nominal_value(p)
 
 
-class SafeExprEvaluator(ast.NodeVisitor):
-    allowed_nodes = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Num, ast.Load,
-                     ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
-                     ast.Pow, ast.USub, ast.UAdd, ast.Name, ast.Call)
+def _is_number(value: Any) -> bool:
+    # what ast.Num used to accept: int/float/complex but not bool
+    return isinstance(value, (int, float, complex)) and not isinstance(value, bool)
+
+
+class SafeExprEvaluator:
+    """Whitelist of the arithmetic an oracle expression may use."""
+    # exact node types; checked with a set lookup instead of isinstance
+    allowed_nodes = frozenset({ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Load,
+                               ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                               ast.Pow, ast.USub, ast.UAdd, ast.Name, ast.Call})
 
     allowed_funcs = {"abs": abs, "min": min, "max": max, "round": round}
 
-    def __init__(self, env: Dict[str, Any]):
-        self.env = env
-
-    def visit(self, node):
-        if not isinstance(node, self.allowed_nodes):
-            raise ValueError("Disallowed expression element")
-        return super().visit(node)
-
-    def visit_Expression(self, node):
-        return self.visit(node.body)
-
-    def visit_BinOp(self, node):
-        left = self.visit(node.left)
-        right = self.visit(node.right)
-        return self._apply_op(node.op, left, right)
-
-    def visit_UnaryOp(self, node):
-        operand = self.visit(node.operand)
-        if isinstance(node.op, ast.USub):
-            return -operand
-        if isinstance(node.op, ast.UAdd):
-            return +operand
-        raise ValueError("Unsupported unary op")
-
-    def visit_Num(self, node):
-        return node.n
-
-    def visit_Name(self, node):
-        if node.id in self.env:
-            return self.env[node.id]
-        raise ValueError(f"Unknown variable {node.id}")
-
-    def visit_Call(self, node):
-        if not isinstance(node.func, ast.Name) or node.func.id not in self.allowed_funcs:
-            raise ValueError("Unsupported function call")
-        func = self.allowed_funcs[node.func.id]
-        args = [self.visit(a) for a in node.args]
-        return func(*args)
-
-    @staticmethod
-    def _apply_op(op, a, b):
-        if isinstance(op, ast.Add):
-            return a + b
-        if isinstance(op, ast.Sub):
-            return a - b
-        if isinstance(op, ast.Mult):
-            return a * b
-        if isinstance(op, ast.Div):
-            return a / b
-        if isinstance(op, ast.FloorDiv):
-            return a // b
-        if isinstance(op, ast.Mod):
-            return a % b
-        if isinstance(op, ast.Pow):
-            return a ** b
-        raise ValueError("Unsupported binary op")
+    @classmethod
+    def validate(cls, tree: ast.AST) -> None:
+        """Reject any node or call outside the whitelist."""
+        for node in ast.walk(tree):
+            if type(node) not in cls.allowed_nodes:
+                raise ValueError("Disallowed expression element")
+            if isinstance(node, ast.Constant) and not _is_number(node.value):
+                raise ValueError("Disallowed expression element")
+            if isinstance(node, ast.Call) and (
+                    not isinstance(node.func, ast.Name) or node.func.id not in cls.allowed_funcs):
+                raise ValueError("Unsupported function call")
+
+
+# Call targets are renamed to these before compiling. They are not valid
+# identifiers, so they can't collide with a spec param called `max` or `min`:
+# calls resolve to allowed_funcs and plain names to the case inputs only.
+_ORACLE_FUNCS = {f"<{name}>": func for name, func in SafeExprEvaluator.allowed_funcs.items()}
+
+
+@lru_cache(maxsize=128)
+def _compile_oracle(expr: str):
+    # Validate once against the whitelist; every case of a spec shares one
+    # oracle string, so the compiled code is reused across cases.
+    tree = ast.parse(expr, mode="eval")
+    SafeExprEvaluator.validate(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            node.func = ast.copy_location(ast.Name(id=f"<{node.func.id}>", ctx=ast.Load()), node.func)
+    return compile(tree, "<oracle>", "eval")
+
+
+_ORACLE_GLOBALS = {"__builtins__": {}}
 
 
 def _eval_oracle(expr: str, inputs: Dict[str, Any]) -> Any:
+    """Evaluate an oracle expression for one case; None if it can't be.
+
+    >>> _eval_oracle("a + b", {"a": 2, "b": 3})
+    5
+    >>> _eval_oracle("max - min", {"max": 5, "min": 1})
+    4
+    >>> _eval_oracle("max(max, 1)", {"max": 5})
+    5
+    >>> _eval_oracle("max - 1", {"a": 5}) is None
+    True
+    """
     try:
-        tree = ast.parse(expr, mode="eval")
-        return SafeExprEvaluator(inputs).visit(tree)
+        code = _compile_oracle(expr)
+        return eval(code, _ORACLE_GLOBALS, {**inputs, **_ORACLE_FUNCS})
     except Exception:
         return None
 
 
-def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+def _build_params(raw_params: List[Dict[str, Any]]) -> List[ParamSpec]:
     params: List[ParamSpec] = []
-    for p in spec.get("params", []):
+    for p in raw_params:
         ps = ParamSpec(
             name=p["name"],
             type=p.get("type", "int"),
@@ -213,8 +206,12 @@ def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
         if ps.boundaries is None:
             ps.boundaries = _derive_default_boundaries(ps)
         params.append(ps)
+    return params
+
+
+def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
     new_spec = dict(spec)
-    new_spec["_params_obj"] = params
+    new_spec["_params_obj"] = _build_params(spec.get("params", []))
     return new_spec
 
 
@@ -230,18 +227,40 @@ def generate_cases(spec: Dict[str, Any]) -> Dict[str, Any]:
     # Nominal baseline inputs
     nominal: Dict[str, Any] = {p.name: _nominal_value(p) for p in params}
 
-    # Equivalence class tests: one-at-a-time variation
+    # Varying one parameter often lands back on the nominal tuple (e.g. the
+    # "zero" class or boundary 0 of each param); keep the first of each kind.
+    dedupe = spec.get("dedupe", True)
+    seen: set = set()
+
+    def _is_new(kind: str, inputs: Dict[str, Any]) -> bool:
+        if not dedupe:
+            return True
+        try:
+            sig = (kind, tuple(sorted(inputs.items())))
+            if sig in seen:
+                return False
+            seen.add(sig)
+        except TypeError:  # unhashable input value
+            pass
+        return True
+
+    # Equivalence class tests: one-at-a-time variation. The varied value is
+    # written into `nominal` in place and restored after each parameter, so
+    # only cases that are kept pay for a copy.
     for p in params:
+        saved = nominal[p.name]
         for ec in p.equivalence_classes or []:
-            rep = _representative_from_ec(ec, p)
-            inputs = dict(nominal)
-            inputs[p.name] = rep
+            nominal[p.name] = _representative_from_ec(ec, p)
+            if not _is_new("equivalence", nominal):
+                continue
             cases.append({
                 "type": "equivalence",
                 "param": p.name,
                 "class": ec.get("name", "anon"),
-                "inputs": inputs,
+                "inputs": nominal.copy(),
             })
+        nominal[p.name] = saved
+    n_equivalence = len(cases)
 
     # Boundary value tests: one-at-a-time plus all-min/all-max when available
     all_min: Dict[str, Any] = {}
@@ -259,23 +278,27 @@ def generate_cases(spec: Dict[str, Any]) -> Dict[str, Any]:
             have_all_min_max = False
 
     for p in params:
+        saved = nominal[p.name]
         for b in p.boundaries or []:
-            inputs = dict(nominal)
-            inputs[p.name] = b
+            nominal[p.name] = b
+            if not _is_new("boundary", nominal):
+                continue
             cases.append({
                 "type": "boundary",
                 "param": p.name,
                 "boundary": b,
-                "inputs": inputs,
+                "inputs": nominal.copy(),
             })
+        nominal[p.name] = saved
 
     if have_all_min_max and all_min and all_max:
         cases.append({"type": "boundary-combo", "label": "all-min", "inputs": all_min})
         cases.append({"type": "boundary-combo", "label": "all-max", "inputs": all_max})
 
+    # equivalence cases are all appended before any boundary case
+    n_boundary = len(cases) - n_equivalence
     return {
-        "counts": {"total": len(cases), "equivalence": sum(1 for c in cases if c["type"]=="equivalence"),
-                    "boundary": sum(1 for c in cases if c["type"].startswith("boundary"))},
+        "counts": {"total": len(cases), "equivalence": n_equivalence, "boundary": n_boundary},
         "cases": cases,
         "nominal": nominal,
         "spec": {k: v for k, v in spec.items() if k != "_params_obj"}
@@ -302,12 +325,20 @@ def render_junit(spec: Dict[str, Any], cases: List[Dict[str, Any]]) -> str:
     cls_simple = class_under_test.split(".")[-1] if class_under_test else "Calculator"
     methodsig_comment = f"// Method under test: {method}\n" if method else ""
 
+    oracle_cache: Dict[Tuple[Any, ...], Any] = {}
+
     sb = []
     sb.append(pkg_line)
     sb.append(imports)
     sb.append(f"public class {test_class} {{\n")
     sb.append(f"    {methodsig_comment}")
 
+    # Spec-level invariants, bound once rather than per case
+    param_order = tuple(p["name"] for p in spec.get("params", []))
+    call_prefix = f"obj.{method}(" if method else "obj.underTest("  # fallback
+    new_expr = f"{cls_simple} obj = new {cls_simple}();"
+
+    # One chunk per test method keeps the part list short for large specs.
     for idx, case in enumerate(cases):
         name_parts = ["spec", case["type"].replace("-", "_")]
         if case["type"] == "equivalence":
@@ -319,42 +350,55 @@ def render_junit(spec: Dict[str, Any], cases: List[Dict[str, Any]]) -> str:
             label = str(label).replace('-', '_')
             name_parts.append(label)
         mname = "test_" + "_".join(name_parts) + f"_{idx}"
-        sb.append("    @Test\n")
-        sb.append(f"    public void {mname}() {{\n")
-        sb.append(f"        {cls_simple} obj = new {cls_simple}();\n")
         # Build invocation
         inputs = case["inputs"]
-        param_order = [p["name"] for p in spec.get("params", [])]
-        args = ", ".join(_java_literal(inputs.get(n)) for n in param_order)
-        if method:
-            call = f"obj.{method}({args})"
-        else:
-            call = f"obj.underTest({args})"  # fallback
+        call = call_prefix + ", ".join(_java_literal(inputs.get(n)) for n in param_order) + ")"
 
         if oracle_expr:
-            expected = _eval_oracle(oracle_expr, inputs)
+            # EC representatives often coincide with boundaries; evaluate
+            # each distinct input tuple once.
+            try:
+                key = tuple(sorted(inputs.items()))
+                if key not in oracle_cache:
+                    oracle_cache[key] = _eval_oracle(oracle_expr, inputs)
+                expected = oracle_cache[key]
+            except TypeError:  # unhashable input value
+                expected = _eval_oracle(oracle_expr, inputs)
             if expected is not None:
-                sb.append(f"        assertEquals({_java_literal(expected)}, {call});\n")
+                body = f"assertEquals({_java_literal(expected)}, {call});"
             else:
-                sb.append(f"        // TODO: Provide oracle; auto-eval failed\n        {call};\n")
+                body = f"// TODO: Provide oracle; auto-eval failed\n        {call};"
         else:
-            sb.append(f"        // TODO: Add assertions for expected behavior\n        {call};\n")
-        sb.append("    }\n\n")
+            body = f"// TODO: Add assertions for expected behavior\n        {call};"
+        sb.append(f"""    @Test
+    public void {mname}() {{
+        {new_expr}
+        {body}
+    }}
+
+""")
 
     sb.append("}\n")
     return "".join(sb)
 
 
+_LITERAL_DISPATCH = {
+    bool: lambda v: "true" if v else "false",
+    int: str,
+    float: lambda v: "%g" % v,  # keep simple formatting
+    type(None): lambda v: "null",
+}
+
+
 def _java_literal(v: Any) -> str:
-    if isinstance(v, bool):
-        return "true" if v else "false"
-    if isinstance(v, int):
-        return str(v)
-    if isinstance(v, float):
-        # keep simple formatting
-        return ("%g" % v)
-    if v is None:
-        return "null"
+    # exact-type lookup first; called once per parameter per case
+    fn = _LITERAL_DISPATCH.get(type(v))
+    if fn is not None:
+        return fn(v)
+    # subclasses (IntEnum, numpy scalars registered as float, ...)
+    for t in (bool, int, float):
+        if isinstance(v, t):
+            return _LITERAL_DISPATCH[t](v)
     return repr(v)
 
 
@@ -366,7 +410,8 @@ def write_junit_file(spec: Dict[str, Any], content: str) -> str:
     dest_dir = Path(out_dir) / pkg_path
     dest_dir.mkdir(parents=True, exist_ok=True)
     path = dest_dir / f"{test_class}.java"
-    path.write_text(content, encoding="utf-8")
+    # one encode and one write, bypassing the text-layer buffer
+    path.write_bytes(content.encode("utf-8"))
     return str(path)
 
 
@@ -3,14 +3,89 @@ Git automation tools for version control workflows.
 Integrates with MCP server for automated commit, push, and PR operations.
 """
 
+import os
+import shlex
+import shutil
 import subprocess
+import threading
+import time
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
 
+_COMMIT_HASH_RE = re.compile(r"\[.*?(\b[a-f0-9]{7}\b)\]")
+_PR_URL_RE = re.compile(r"https://github\.com/[\w-]+/[\w-]+/pull/\d+")
+_PR_NUMBER_RE = re.compile(r"/pull/(\d+)")
+
+def _git_env() -> Dict[str, str]:
+    """Environment for git subprocesses.
+
+    GIT_OPTIONAL_LOCKS=0 stops read-only commands such as `git status` from
+    taking .git/index.lock to write back a refreshed index, so they don't
+    contend with an add/commit running right after them.
+    """
+    env = dict(os.environ)
+    env["GIT_OPTIONAL_LOCKS"] = "0"
+    return env
+
+
+def _decode(output: Optional[bytes]) -> str:
+    """Decode captured git output once (git writes paths as UTF-8)."""
+    return output.decode("utf-8", "replace").strip() if output else ""
+
+
+def autocommit_line() -> str:
+    """Default autocommit line: 'autocommit: <UTC ISO-8601 time with microseconds>'."""
+    ns = time.time_ns()
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ns // 1_000_000_000))
+    return f"autocommit: {stamp}.{ns // 1000 % 1_000_000:06d}\n"
+
+
+def append_text(path, content: str) -> None:
+    """
+    Append content to path with a single O_APPEND write.
+    
+    Binary mode on every platform, so all writers of a shared file such as
+    .autocommit produce the same line endings.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        os.write(fd, content.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+# Repository paths already probed by GitAutomation._validate_repo
+_VALIDATED_REPOS = set()
+
+
+_CONFLICT_CODES = frozenset({"UU", "AA", "DD", "DU", "UD"})
+_STAGED_CODES = frozenset("MADR")
+_UNSTAGED_CODES = frozenset("MD")
+
+
+def _classify_status(xy: str) -> Optional[str]:
+    """Map a two-letter XY status code to the GitStatus list it belongs in."""
+    # Check for merge conflicts
+    if xy in _CONFLICT_CODES:
+        return "conflicts"
+    # Staged changes
+    if xy[0] in _STAGED_CODES:
+        return "staged"
+    # Unstaged changes
+    if xy[1] in _UNSTAGED_CODES:
+        return "unstaged"
+    return None
+
+
+# Every XY pair porcelain v2 can emit ("." marks an unmodified side)
+_STATUS_TABLE = {x + y: _classify_status(x + y) for x in ".MTADRCU" for y in ".MTADRCU"}
+
+
 @dataclass
 class GitStatus:
     """Represents the current git repository status."""
@@ -59,10 +134,16 @@ class GitAutomation:
 
     def _validate_repo(self) -> None:
         """Validate that the path is a valid git repository."""
+        # server.py builds several instances over the same path; probe once
+        key = os.path.realpath(self.repo_path)
+        if key in _VALIDATED_REPOS:
+            return
         try:
-            self._run_git(["rev-parse", "--git-dir"])
+            returncode, _, _ = self._run_git(["rev-parse", "--git-dir"])
         except subprocess.CalledProcessError:
             raise GitToolsError(f"Not a valid git repository: {self.repo_path}")
+        if returncode == 0:
+            _VALIDATED_REPOS.add(key)
 
     def _run_git(self, args: List[str], capture_output: bool = True) -> Tuple[int, str, str]:
         """
@@ -80,16 +161,106 @@ class GitAutomation:
             result = subprocess.run(
                 cmd,
                 cwd=str(self.repo_path),
+                stdin=subprocess.DEVNULL,
                 capture_output=capture_output,
-                text=True,
+                env=_git_env(),
                 timeout=30
             )
-            return result.returncode, result.stdout.strip(), result.stderr.strip()
+            return result.returncode, _decode(result.stdout), _decode(result.stderr)
         except subprocess.TimeoutExpired:
             raise GitToolsError(f"Git command timed out: {' '.join(cmd)}")
         except Exception as e:
             raise GitToolsError(f"Git command failed: {e}")
 
+    def _run_git_streaming(self, args: List[str], timeout: float = 30) -> Iterator[str]:
+        """
+        Run a git command that writes NUL-terminated records (-z) and yield
+        each record as soon as it has been read.
+        
+        Args:
+            args: List of git command arguments
+            timeout: Seconds before the git process is killed
+            
+        Raises:
+            subprocess.CalledProcessError: If git exits non-zero (stderr attached)
+            GitToolsError: If git can't be started or times out
+        """
+        cmd = ["git"] + args
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                cwd=str(self.repo_path),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=_git_env()
+            )
+        except Exception as e:
+            raise GitToolsError(f"Git command failed: {e}")
+
+        # Drain stderr alongside stdout: git blocks once either pipe fills, and
+        # a full stderr pipe would otherwise stall it until the timer fires.
+        stderr_chunks = []
+
+        def _drain_stderr():
+            try:
+                stderr_chunks.append(proc.stderr.read())
+            except (OSError, ValueError):  # pipe closed early by `with proc`
+                pass
+
+        drain = threading.Thread(target=_drain_stderr, daemon=True)
+        drain.start()
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            with proc:
+                pending = b""
+                while True:
+                    chunk = proc.stdout.read1(65536)
+                    if not chunk:
+                        break
+                    *records, pending = (pending + chunk).split(b"\0")
+                    for record in records:
+                        yield record.decode("utf-8", "replace")
+                if pending:
+                    yield pending.decode("utf-8", "replace")
+                returncode = proc.wait()
+                drain.join()
+                stderr = b"".join(stderr_chunks).decode("utf-8", "replace").strip()
+        finally:
+            timer.cancel()
+        if returncode < 0:
+            raise GitToolsError(f"Git command timed out: {' '.join(cmd)}")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+    def _run_git_script(self, script: str) -> Tuple[int, str, str]:
+        """
+        Run a POSIX shell script of git commands in one process.
+        
+        Args:
+            script: Shell script; callers must quote arguments with shlex.quote
+            
+        Returns:
+            Tuple of (return_code, stdout, stderr)
+        """
+        try:
+            result = subprocess.run(
+                script,
+                shell=True,
+                executable="/bin/sh",
+                cwd=str(self.repo_path),
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                env=_git_env(),
+                timeout=60
+            )
+            return result.returncode, _decode(result.stdout), _decode(result.stderr)
+        except subprocess.TimeoutExpired:
+            raise GitToolsError("Git script timed out")
+        except Exception as e:
+            raise GitToolsError(f"Git script failed: {e}")
+
     def git_status(self) -> GitStatus:
         """
         Get current git repository status.
@@ -100,38 +271,46 @@ class GitAutomation:
         Raises:
             GitToolsError: If git command fails
         """
-        # Get status in porcelain format
-        returncode, stdout, stderr = self._run_git(["status", "--porcelain"])
-        if returncode != 0:
-            raise GitToolsError(f"Failed to get git status: {stderr}")
+        # One call for both the entries and the branch header; -z keeps
+        # filenames with spaces/newlines intact. Entries are classified as
+        # git writes them rather than after the whole listing is buffered.
+        records = self._run_git_streaming(["status", "--porcelain=v2", "--branch", "-z"])
 
         staged_files = []
         unstaged_files = []
         conflicts = []
         untracked_files = []
+        current_branch = "unknown"
+        buckets = {"conflicts": conflicts, "staged": staged_files, "unstaged": unstaged_files}
 
-        for line in stdout.split("\n"):
-            if not line:
-                continue
-            status = line[:2]
-            filename = line[3:]
-
-            # Check for merge conflicts
-            if status in ("UU", "AA", "DD", "DU", "UD"):
-                conflicts.append(filename)
-            # Staged changes
-            elif status[0] in ("M", "A", "D", "R"):
-                staged_files.append(filename)
-            # Unstaged changes
-            elif status[1] in ("M", "D"):
-                unstaged_files.append(filename)
-            # Untracked files
-            elif status == "??":
-                untracked_files.append(filename)
-
-        # Get current branch
-        returncode, branch, stderr = self._run_git(["rev-parse", "--abbrev-ref", "HEAD"])
-        current_branch = branch if returncode == 0 else "unknown"
+        try:
+            for record in records:
+                if not record:
+                    continue
+                kind = record[0]
+                if kind == "#":
+                    if record.startswith("# branch.head "):
+                        head = record[len("# branch.head "):]
+                        # match `rev-parse --abbrev-ref HEAD` on a detached head
+                        current_branch = "HEAD" if head == "(detached)" else head
+                    continue
+                if kind == "?":
+                    untracked_files.append(record[2:])
+                    continue
+                if kind == "1":
+                    fields = record.split(" ", 8)
+                elif kind == "2":
+                    fields = record.split(" ", 9)
+                    next(records, None)  # skip the rename/copy source path
+                elif kind == "u":
+                    fields = record.split(" ", 10)
+                else:
+                    continue  # "!" ignored entries
+                bucket = _STATUS_TABLE.get(fields[1])
+                if bucket is not None:
+                    buckets[bucket].append(fields[-1])
+        except subprocess.CalledProcessError as e:
+            raise GitToolsError(f"Failed to get git status: {e.stderr}")
 
         is_clean = len(staged_files) == 0 and len(unstaged_files) == 0 and len(conflicts) == 0
 
@@ -144,6 +323,76 @@ class GitAutomation:
             untracked_files=untracked_files
         )
 
+    def _current_branch(self) -> str:
+        """
+        Current branch name without scanning the worktree.
+        
+        Returns "HEAD" on a detached head (as git_status does) and "unknown"
+        if HEAD can't be read.
+        """
+        returncode, branch, _ = self._run_git(["symbolic-ref", "--short", "-q", "HEAD"])
+        if returncode == 0:
+            return branch
+        return "HEAD" if returncode == 1 else "unknown"
+
+    DEFAULT_EXCLUDE_PATTERNS = [
+        "target/*",
+        "build/*",
+        "__pycache__/*",
+        "*.class",
+        "*.pyc",
+        "*.egg-info/*",
+        ".pytest_cache/*",
+        ".coverage",
+        "*.o",
+        "*.so",
+        "node_modules/*"
+    ]
+
+    @staticmethod
+    def _add_pathspecs(exclude_patterns: List[str]) -> List[str]:
+        """Pathspecs for `git add --all` covering the whole repo minus the excludes."""
+        return [":(top)"] + [f":(top,exclude){pattern}" for pattern in exclude_patterns]
+
+    @staticmethod
+    def _parse_add_verbose(output: str) -> List[str]:
+        """Extract paths from `git add --verbose` lines (add 'x' / remove 'x')."""
+        files = []
+        for line in output.split("\n"):
+            if line.endswith("'"):
+                if line.startswith("add '"):
+                    files.append(line[5:-1])
+                elif line.startswith("remove '"):
+                    files.append(line[8:-1])
+        return files
+
+    @classmethod
+    def _stage_result(cls, returncode: int, stdout: str, stderr: str, exclude_patterns: List[str]) -> Dict:
+        """Result dict for a `git add --all --verbose` run."""
+        if returncode != 0:
+            return {
+                "success": False,
+                "message": f"Failed to stage files: {stderr}",
+                "staged_count": 0
+            }
+
+        files_to_add = cls._parse_add_verbose(stdout)
+        if not files_to_add:
+            return {
+                "success": True,
+                "message": "No files to stage (all changes filtered)",
+                "staged_count": 0,
+                "excluded_patterns": exclude_patterns
+            }
+
+        return {
+            "success": True,
+            "message": f"Successfully staged {len(files_to_add)} file(s)",
+            "staged_count": len(files_to_add),
+            "staged_files": files_to_add,
+            "excluded_patterns": exclude_patterns
+        }
+
     def git_add_all(self, exclude_patterns: Optional[List[str]] = None) -> Dict:
         """
         Stage all changes with intelligent filtering.
@@ -156,69 +405,14 @@ class GitAutomation:
             Dict with staging result
         """
         if exclude_patterns is None:
-            exclude_patterns = [
-                "target/*",
-                "build/*",
-                "__pycache__/*",
-                "*.class",
-                "*.pyc",
-                "*.egg-info/*",
-                ".pytest_cache/*",
-                ".coverage",
-                "*.o",
-                "*.so",
-                "node_modules/*"
-            ]
+            exclude_patterns = list(self.DEFAULT_EXCLUDE_PATTERNS)
 
         try:
-            # First, get all modified files
-            returncode, stdout, stderr = self._run_git(["status", "--porcelain"])
-            if returncode != 0:
-                return {
-                    "success": False,
-                    "message": f"Failed to get status: {stderr}",
-                    "staged_count": 0
-                }
-
-            files_to_add = []
-            for line in stdout.split("\n"):
-                if not line:
-                    continue
-                filename = line[3:]
-
-                # Skip files matching exclude patterns
-                should_exclude = any(
-                    self._matches_pattern(filename, pattern)
-                    for pattern in exclude_patterns
-                )
-
-                if not should_exclude and filename:
-                    files_to_add.append(filename)
-
-            if not files_to_add:
-                return {
-                    "success": True,
-                    "message": "No files to stage (all changes filtered)",
-                    "staged_count": 0,
-                    "excluded_patterns": exclude_patterns
-                }
-
-            # Stage the files
-            returncode, stdout, stderr = self._run_git(["add"] + files_to_add)
-            if returncode != 0:
-                return {
-                    "success": False,
-                    "message": f"Failed to stage files: {stderr}",
-                    "staged_count": 0
-                }
-
-            return {
-                "success": True,
-                "message": f"Successfully staged {len(files_to_add)} file(s)",
-                "staged_count": len(files_to_add),
-                "staged_files": files_to_add,
-                "excluded_patterns": exclude_patterns
-            }
+            # git applies the excludes itself; --verbose reports what it staged
+            returncode, stdout, stderr = self._run_git(
+                ["add", "--all", "--verbose", "--"] + self._add_pathspecs(exclude_patterns)
+            )
+            return self._stage_result(returncode, stdout, stderr, exclude_patterns)
 
         except Exception as e:
             return {
@@ -227,6 +421,40 @@ class GitAutomation:
                 "staged_count": 0
             }
 
+    @classmethod
+    def _full_commit_message(cls, message: str, coverage_stats: Optional[Dict]) -> str:
+        """Commit message with coverage stats appended if provided."""
+        if coverage_stats:
+            return message + "\n\n" + cls._format_coverage_stats(coverage_stats)
+        return message
+
+    @classmethod
+    def _commit_result(
+        cls,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        message: str,
+        nothing_staged: bool
+    ) -> CommitResult:
+        """CommitResult for a `git commit` run; nothing_staged from `diff --cached --quiet`."""
+        if returncode != 0:
+            if nothing_staged:
+                return CommitResult(
+                    success=False,
+                    message="No staged changes to commit"
+                )
+            return CommitResult(
+                success=False,
+                message=f"Commit failed: {stderr}"
+            )
+
+        return CommitResult(
+            success=True,
+            message=f"Commit successful: {message}",
+            commit_hash=cls._extract_commit_hash(stdout)
+        )
+
     def git_commit(self, message: str, coverage_stats: Optional[Dict] = None) -> CommitResult:
         """
         Automated commit with standardized messages and optional coverage stats.
@@ -239,36 +467,15 @@ class GitAutomation:
             CommitResult with commit details
         """
         try:
-            # Build commit message with coverage stats if provided
-            full_message = message
-            if coverage_stats:
-                full_message += "\n\n"
-                full_message += self._format_coverage_stats(coverage_stats)
-
-            # Verify we have staged changes
-            status = self.git_status()
-            if not status.staged_files:
-                return CommitResult(
-                    success=False,
-                    message="No staged changes to commit"
-                )
-
             # Perform the commit
+            full_message = self._full_commit_message(message, coverage_stats)
             returncode, stdout, stderr = self._run_git(["commit", "-m", full_message])
+            nothing_staged = False
             if returncode != 0:
-                return CommitResult(
-                    success=False,
-                    message=f"Commit failed: {stderr}"
-                )
-
-            # Extract commit hash from output
-            commit_hash = self._extract_commit_hash(stdout)
-
-            return CommitResult(
-                success=True,
-                message=f"Commit successful: {message}",
-                commit_hash=commit_hash
-            )
+                # Only pay for the staged-changes check when the commit failed
+                cached_rc, _, _ = self._run_git(["diff", "--cached", "--quiet"])
+                nothing_staged = cached_rc == 0
+            return self._commit_result(returncode, stdout, stderr, message, nothing_staged)
 
         except Exception as e:
             return CommitResult(
@@ -276,6 +483,25 @@ class GitAutomation:
                 message=f"Error during commit: {str(e)}"
             )
 
+    @staticmethod
+    def _push_result(returncode: int, stdout: str, stderr: str, remote: str, branch: str) -> Dict:
+        """Result dict for a `git push -u` run."""
+        if returncode != 0:
+            return {
+                "success": False,
+                "message": f"Push failed: {stderr}",
+                "remote": remote,
+                "branch": branch
+            }
+
+        return {
+            "success": True,
+            "message": f"Successfully pushed {branch} to {remote}",
+            "remote": remote,
+            "branch": branch,
+            "output": stdout
+        }
+
     def git_push(self, remote: str = "origin", branch: Optional[str] = None) -> Dict:
         """
         Push to remote with upstream configuration.
@@ -290,29 +516,13 @@ class GitAutomation:
         try:
             # Get current branch if not specified
             if branch is None:
-                status = self.git_status()
-                branch = status.current_branch
+                branch = self._current_branch()
 
             # Configure upstream and push
             returncode, stdout, stderr = self._run_git(
                 ["push", "-u", remote, branch]
             )
-
-            if returncode != 0:
-                return {
-                    "success": False,
-                    "message": f"Push failed: {stderr}",
-                    "remote": remote,
-                    "branch": branch
-                }
-
-            return {
-                "success": True,
-                "message": f"Successfully pushed {branch} to {remote}",
-                "remote": remote,
-                "branch": branch,
-                "output": stdout
-            }
+            return self._push_result(returncode, stdout, stderr, remote, branch)
 
         except Exception as e:
             return {
@@ -352,8 +562,7 @@ class GitAutomation:
                 )
 
             # Get current branch
-            status = self.git_status()
-            current_branch = status.current_branch
+            current_branch = self._current_branch()
 
             if current_branch == "main" or current_branch == "master":
                 return PullRequestResult(
@@ -368,12 +577,7 @@ class GitAutomation:
                 pr_body += "\n\n## Coverage Statistics\n"
                 pr_body += self._format_coverage_stats(coverage_stats)
 
-            # Create PR using GitHub CLI
-            returncode, stdout, stderr = self._run_git(
-                ["credential", "helpers"]  # Just verify credentials are available
-            )
-
-            # Use gh CLI to create PR
+            # Use gh CLI to create PR; it reports missing auth itself
             cmd = [
                 "gh", "pr", "create",
                 "--base", base,
@@ -421,12 +625,6 @@ class GitAutomation:
             )
 
     # Helper methods
-    @staticmethod
-    def _matches_pattern(filename: str, pattern: str) -> bool:
-        """Check if filename matches a glob pattern."""
-        from fnmatch import fnmatch
-        return fnmatch(filename, pattern)
-
     @staticmethod
     def _format_coverage_stats(stats: Dict) -> str:
         """Format coverage statistics for commit/PR message."""
@@ -439,40 +637,33 @@ class GitAutomation:
     @staticmethod
     def _extract_commit_hash(output: str) -> Optional[str]:
         """Extract commit hash from git output."""
-        match = re.search(r"\[.*?(\b[a-f0-9]{7}\b)\]", output)
+        match = _COMMIT_HASH_RE.search(output)
         return match.group(1) if match else None
 
     @staticmethod
     def _extract_pr_url(output: str) -> str:
         """Extract PR URL from gh CLI output."""
-        match = re.search(r"https://github\.com/[\w-]+/[\w-]+/pull/\d+", output)
+        match = _PR_URL_RE.search(output)
         return match.group(0) if match else output.strip()
 
     @staticmethod
     def _extract_pr_number(pr_url: str) -> Optional[int]:
         """Extract PR number from URL."""
-        match = re.search(r"/pull/(\d+)", pr_url)
+        match = _PR_NUMBER_RE.search(pr_url)
         return int(match.group(1)) if match else None
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _check_command_exists(command: str) -> bool:
-        """Check if a command exists in PATH."""
-        try:
-            subprocess.run(
-                ["where" if subprocess.os.name == "nt" else "which", command],
-                capture_output=True,
-                timeout=5
-            )
-            return True
-        except Exception:
-            return False
+        """Check if a command exists in PATH (looked up once per process)."""
+        return shutil.which(command) is not None
 
 
 class WorkflowIntegration:
     """Integrates git operations with testing workflows."""
 
-    def __init__(self, repo_path: str = "."):
-        self.git = GitAutomation(repo_path)
+    def __init__(self, repo_path: str = ".", git: Optional[GitAutomation] = None):
+        self.git = git if git is not None else GitAutomation(repo_path)
 
     def commit_on_coverage_threshold(
         self,
@@ -525,26 +716,12 @@ class WorkflowIntegration:
         """
         results = {}
 
-        # Stage changes
-        stage_result = self.git.git_add_all()
-        results["stage"] = stage_result
-        if not stage_result["success"]:
-            return results
-
-        # Commit
-        commit_result = self.git.git_commit(commit_message, coverage_stats)
-        results["commit"] = {
-            "success": commit_result.success,
-            "message": commit_result.message,
-            "hash": commit_result.commit_hash
-        }
-        if not commit_result.success:
-            return results
-
-        # Push
-        push_result = self.git.git_push(remote=push_remote)
-        results["push"] = push_result
-        if not push_result["success"]:
+        if os.name == "nt":
+            # no POSIX shell to chain the steps in
+            pushed = self._stage_commit_push_stepwise(results, commit_message, push_remote, coverage_stats)
+        else:
+            pushed = self._stage_commit_push_batched(results, commit_message, push_remote, coverage_stats)
+        if not pushed:
             return results
 
         # Create PR if requested
@@ -562,3 +739,94 @@ class WorkflowIntegration:
             }
 
         return results
+
+    def _stage_commit_push_stepwise(
+        self,
+        results: Dict,
+        commit_message: str,
+        push_remote: str,
+        coverage_stats: Optional[Dict]
+    ) -> bool:
+        """Run stage, commit and push as separate git calls; True if all succeeded."""
+        # Stage changes
+        stage_result = self.git.git_add_all()
+        results["stage"] = stage_result
+        if not stage_result["success"]:
+            return False
+
+        # Commit
+        commit_result = self.git.git_commit(commit_message, coverage_stats)
+        results["commit"] = self._commit_step(commit_result)
+        if not commit_result.success:
+            return False
+
+        # Push
+        push_result = self.git.git_push(remote=push_remote)
+        results["push"] = push_result
+        return push_result["success"]
+
+    def _stage_commit_push_batched(
+        self,
+        results: Dict,
+        commit_message: str,
+        push_remote: str,
+        coverage_stats: Optional[Dict]
+    ) -> bool:
+        """
+        Run stage, commit and push as one shell script; True if all succeeded.
+        
+        Each step's stdout and stderr are NUL-separated from the next step's,
+        and each step exits with its own code, so the results are built by the
+        same helpers git_add_all, git_commit and git_push use.
+        """
+        git = self.git
+        exclude_patterns = list(git.DEFAULT_EXCLUDE_PATTERNS)
+        full_message = git._full_commit_message(commit_message, coverage_stats)
+
+        pathspecs = " ".join(shlex.quote(p) for p in git._add_pathspecs(exclude_patterns))
+        step_end = "printf '\\0'; printf '\\0' >&2"
+        script = "\n".join([
+            f"git add --all --verbose -- {pathspecs} || exit 101",
+            step_end,
+            # a failed commit with an empty index means there was nothing to commit
+            f"git commit -m {shlex.quote(full_message)} || {{ git diff --cached --quiet && exit 104; exit 102; }}",
+            step_end,
+            # same fallbacks as GitAutomation._current_branch
+            "branch=$(git symbolic-ref --short -q HEAD); rc=$?",
+            'if [ $rc -eq 1 ]; then branch=HEAD; elif [ $rc -ne 0 ]; then branch=unknown; fi',
+            "printf '%s\\0' \"$branch\"",
+            f'git push -u {shlex.quote(push_remote)} "$branch" || exit 103',
+        ])
+        returncode, stdout, stderr = git._run_git_script(script)
+        outs = [part.strip() for part in stdout.split("\0")]
+        errs = [part.strip() for part in stderr.split("\0")]
+        outs += [""] * (4 - len(outs))
+        errs += [""] * (3 - len(errs))
+        add_out, commit_out, branch, push_out = outs[:4]
+        add_err, commit_err, push_err = errs[:3]
+
+        results["stage"] = git._stage_result(
+            returncode if returncode == 101 else 0, add_out, add_err, exclude_patterns
+        )
+        if not results["stage"]["success"]:
+            return False
+
+        commit_failed = returncode in (102, 104)
+        commit_result = git._commit_result(
+            1 if commit_failed else 0, commit_out, commit_err, commit_message, returncode == 104
+        )
+        results["commit"] = self._commit_step(commit_result)
+        if not commit_result.success:
+            return False
+
+        results["push"] = git._push_result(returncode, push_out, push_err, push_remote, branch)
+        return results["push"]["success"]
+
+    @staticmethod
+    def _commit_step(commit_result: CommitResult) -> Dict:
+        """automated_workflow's dict form of a CommitResult."""
+        return {
+            "success": commit_result.success,
+            "message": commit_result.message,
+            "hash": commit_result.commit_hash
+        }
@@ -8,6 +8,8 @@ ORIGINAL = Path(__file__).parent.parent / '.mcp' / 'parse_jacoco.py'
 if __name__ == '__main__':
     if ORIGINAL.exists():
         code = ORIGINAL.read_text(encoding='utf-8', errors='ignore')
+        # the original imports its sibling helpers (optional_deps)
+        sys.path.insert(0, str(ORIGINAL.parent))
         # Execute in a fresh globals dict.
         exec(compile(code, str(ORIGINAL), 'exec'), {})
     else:
@@ -18,6 +18,7 @@ Examples:
 """
 
 import argparse
+import os
 import re
 import sys
 from collections import deque
@@ -84,6 +85,142 @@ def search_stream(stream, name, pattern, show_numbers, show_counts, context):
     return match_count
 
 
+CHUNK_SIZE = 65536
+
+# ASCII letters that IGNORECASE also matches against non-ASCII characters
+# (i/I ~ U+0130/U+0131, k/K ~ U+212A, s/S ~ U+017F); bytes.lower() can't see those
+_UNICODE_FOLDING_LETTERS = frozenset("iksIKS")
+
+
+def literal_needle(search_string, use_regex, ignore_case):
+    """Return the bytes needle for a chunked file scan, or None if not eligible.
+
+    Only plain substring searches qualify, and only when matching raw UTF-8
+    bytes gives the same answer as matching decoded lines.
+    """
+    if use_regex or "\n" in search_string or "\r" in search_string:
+        return None
+    if ignore_case:
+        if not search_string.isascii() or _UNICODE_FOLDING_LETTERS.intersection(search_string):
+            return None
+        search_string = search_string.lower()
+    return search_string.encode("utf-8")
+
+
+def _line_starts_back(data, start, stop, n):
+    """Offsets of up to the last n lines of data[start:stop] (stop is a line start)."""
+    starts = []
+    i = stop
+    while i > start and len(starts) < n:
+        j = data.rfind(b"\n", start, i - 1)
+        i = start if j < 0 else j + 1
+        starts.append(i)
+    starts.reverse()
+    return starts
+
+
+def search_file_chunked(path, name, needle, ignore_case, show_numbers, show_counts, context):
+    """Search a file for a literal needle by scanning raw byte chunks.
+
+    Produces the same output as search_stream() over the file opened in text
+    mode, but only splits out and decodes the lines that get printed.
+    Before-context is tracked as byte offsets into the current buffer; the
+    last few unmatched lines are carried into the next buffer as a prefix.
+
+    Args:
+        path: file to read.
+        name: display name for the file.
+        needle: bytes from literal_needle(); already lower-cased if ignore_case.
+        ignore_case: match against an ASCII-lowered copy of each chunk.
+        show_numbers, show_counts, context: as for search_stream().
+    Returns:
+        match_count (int)
+    """
+    prefix = f"{name}:" if name not in (None, "-") else ""
+    keep_context = context if not show_counts else 0
+    after = 0
+    match_count = 0
+    lineno = 0
+
+    def emit(num, line):
+        num = f"{num}:" if show_numbers else ""
+        print(f"{prefix}{num}{line.decode('utf-8', 'replace')}")
+
+    def scan(data, pos, end):
+        """Scan the whole lines in data[pos:end]; data[:pos] is carried context.
+
+        Returns the offset from which data[:end] should be carried over.
+        """
+        nonlocal after, match_count, lineno
+        haystack = data.lower() if ignore_case else data
+        ctx_start = 0  # earliest line usable as before-context
+        while pos < end:
+            # tail context of a previous match: printed, never searched
+            if after > 0:
+                while after > 0 and pos < end:
+                    nl = data.find(b"\n", pos, end)
+                    le = end if nl < 0 else nl
+                    lineno += 1
+                    emit(lineno, data[pos:le])
+                    after -= 1
+                    pos = le + 1
+                ctx_start = pos
+            m = haystack.find(needle, pos, end) if pos < end else -1
+            if m < 0:
+                break
+            nl = data.rfind(b"\n", pos, m)
+            ls = pos if nl < 0 else nl + 1
+            nl = data.find(b"\n", m, end)
+            le = end if nl < 0 else nl
+            lineno += data.count(b"\n", pos, ls) + 1
+            match_count += 1
+            if not show_counts:
+                starts = _line_starts_back(data, ctx_start, ls, context) if context else ()
+                for i, a in enumerate(starts, start=lineno - len(starts)):
+                    emit(i, data[a:data.find(b"\n", a)])
+                emit(lineno, data[ls:le])
+                after = context
+            pos = le + 1
+            # lines before a match are never context for the next one
+            ctx_start = pos
+        if pos < end:
+            # no match in the rest of the buffer
+            lineno += data.count(b"\n", pos, end) + (0 if data[end - 1:end] == b"\n" else 1)
+        if not keep_context or after > 0 or ctx_start >= end:
+            return end
+        starts = _line_starts_back(data, ctx_start, end, keep_context)
+        return starts[0] if starts else end
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        carry = b""
+        kept = 0  # bytes at the front of carry that are context lines
+        while True:
+            chunk = os.read(fd, CHUNK_SIZE)
+            data = carry + chunk
+            if b"\r" in data:
+                # universal newlines, as text mode does; hold back a trailing
+                # '\r' in case the next chunk starts with '\n'
+                pending = b"\r" if chunk and data.endswith(b"\r") else b""
+                if pending:
+                    data = data[:-1]
+                data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n") + pending
+            if not chunk:
+                if len(data) > kept:
+                    scan(data, kept, len(data))
+                break
+            cut = data.rfind(b"\n") + 1
+            if cut <= kept:
+                carry = data
+                continue
+            keep_from = scan(data, kept, cut)
+            carry = data[keep_from:]
+            kept = cut - keep_from
+    finally:
+        os.close(fd)
+    return match_count
+
+
 def compile_pattern(search_string, use_regex, ignore_case):
     flags = re.MULTILINE
     if ignore_case:
@@ -107,6 +244,7 @@ def main(argv=None):
     args = parser.parse_args(argv)
 
     pattern = compile_pattern(args.search, args.regex, args.ignore_case)
+    needle = literal_needle(args.search, args.regex, args.ignore_case)
 
     total_matches = 0
     first = True
@@ -119,6 +257,8 @@ def main(argv=None):
                 # read from stdin
                 stream = sys.stdin
                 match_count = search_stream(stream, name if multiple_files else None, pattern, args.line_numbers, args.count, args.context)
+            elif needle is not None:
+                match_count = search_file_chunked(file_path, name if multiple_files else file_path, needle, args.ignore_case, args.line_numbers, args.count, args.context)
             else:
                 with open(file_path, 'r', encoding='utf-8', errors='replace') as fh:
                     match_count = search_stream(fh, name if multiple_files else file_path, pattern, args.line_numbers, args.count, args.context)
@@ -1,12 +1,14 @@
 from fastmcp import FastMCP
-import subprocess
+import asyncio
 import shlex
+import shutil
 import signal
 import sys
 import time
 import threading
-from git_tools import GitAutomation, WorkflowIntegration, GitStatus
+from git_tools import GitAutomation, WorkflowIntegration, GitStatus, append_text, autocommit_line
 import importlib.util
+from collections import deque
 from pathlib import Path
 
 # Create MCP instance
@@ -29,32 +31,75 @@ def divide(a: int, b: int) -> float:
     return a / b if b != 0 else float("inf")
 
 
+# Tool output keeps only the last lines of each stream; a full `mvn clean test`
+# log can run to megabytes and the tail holds the build result
+_OUTPUT_TAIL_LINES = 2000
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int = _OUTPUT_TAIL_LINES) -> str:
+    """Drain a subprocess pipe as it is written, keeping at most `limit` lines."""
+    tail = deque(maxlen=limit)
+    total = 0
+    pending = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).split(b"\n")
+        tail.extend(lines)
+        total += len(lines)
+    if pending:
+        tail.append(pending)
+        total += 1
+    text = b"\n".join(tail).decode("utf-8", "replace")
+    if tail and not pending:
+        text += "\n"
+    if total > limit:
+        text = f"... ({total - limit} earlier lines omitted)\n" + text
+    return text
+
+
+async def _run_command(cmd: list) -> tuple:
+    """Run a command without blocking the event loop; return (returncode, stdout, stderr)."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await asyncio.gather(_read_tail(proc.stdout), _read_tail(proc.stderr))
+    return await proc.wait(), out, err
+
+
 @mcp.tool(description="Generate JUnit tests from Java sources (runs .mcp/generate_tests.py)")
-def generate_tests() -> str:
+async def generate_tests() -> str:
     """Run the test generator script and return its stdout/stderr."""
     cmd = ["python3", ".mcp/generate_tests.py"]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    out = p.stdout.strip()
-    err = p.stderr.strip()
-    return ("OK:\n" + out) if p.returncode == 0 else ("ERROR:\n" + err + "\n" + out)
+    returncode, stdout, stderr = await _run_command(cmd)
+    out = stdout.strip()
+    err = stderr.strip()
+    return ("OK:\n" + out) if returncode == 0 else ("ERROR:\n" + err + "\n" + out)
+
+
+# The Maven Daemon keeps a warm JVM between builds; use it when it is installed
+_MAVEN = "mvnd" if shutil.which("mvnd") else "mvn"
 
 
-@mcp.tool(description="Run Maven tests (mvn -U clean test)")
-def run_tests() -> str:
+@mcp.tool(description="Run Maven tests (mvn -U clean test, via mvnd when available)")
+async def run_tests() -> str:
     """Run mvn tests and return build output (stdout/stderr)."""
-    cmd = ["mvn", "-U", "clean", "test"]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    out = p.stdout + "\n" + p.stderr
-    prefix = "OK" if p.returncode == 0 else f"FAIL (code {p.returncode})"
+    cmd = [_MAVEN, "-U", "clean", "test"]
+    returncode, stdout, stderr = await _run_command(cmd)
+    out = stdout + "\n" + stderr
+    prefix = "OK" if returncode == 0 else f"FAIL (code {returncode})"
     return prefix + ":\n" + out
 
 
 @mcp.tool(description="Analyze JaCoCo coverage and return recommendations")
-def analyze_coverage() -> str:
+async def analyze_coverage() -> str:
     """Run the coverage analyzer script and return its output."""
     cmd = ["python3", ".mcp/coverage_analyzer.py"]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    out = p.stdout + "\n" + p.stderr
+    returncode, stdout, stderr = await _run_command(cmd)
+    out = stdout + "\n" + stderr
     return out.strip()
 
 
@@ -64,7 +109,16 @@ def analyze_coverage() -> str:
 
 # Initialize git tools
 git_automation = GitAutomation(".")
-workflow = WorkflowIntegration(".")
+workflow = WorkflowIntegration(".", git=git_automation)
+
+# Clients tend to poll git_status in bursts; reuse a result for a short window
+# rather than forking git each time. Tools that change the index or HEAD reset it.
+_STATUS_TTL = 0.5
+_STATUS_CACHE = {"ts": 0.0, "val": None}
+
+
+def _invalidate_status_cache():
+    _STATUS_CACHE["ts"] = 0.0
 
 
 @mcp.tool(description="Get current git repository status")
@@ -80,9 +134,11 @@ def git_status() -> dict:
     - current_branch: Current branch name
     - untracked_files: List of untracked files
     """
+    if _STATUS_CACHE["val"] is not None and time.monotonic() - _STATUS_CACHE["ts"] < _STATUS_TTL:
+        return dict(_STATUS_CACHE["val"])
     try:
         status = git_automation.git_status()
-        return {
+        result = {
             "success": True,
             "is_clean": status.is_clean,
             "staged_files": status.staged_files,
@@ -92,6 +148,9 @@ def git_status() -> dict:
             "untracked_files": status.untracked_files,
             "message": "Repository is clean" if status.is_clean else "Repository has changes"
         }
+        _STATUS_CACHE["val"] = result
+        _STATUS_CACHE["ts"] = time.monotonic()
+        return dict(result)
     except Exception as e:
         return {
             "success": False,
@@ -111,6 +170,7 @@ def git_add_all(exclude_patterns: list = None) -> dict:
     """
     try:
         result = git_automation.git_add_all(exclude_patterns)
+        _invalidate_status_cache()
         return result
     except Exception as e:
         return {
@@ -132,6 +192,7 @@ def git_commit(message: str, coverage_stats: dict = None) -> dict:
     """
     try:
         result = git_automation.git_commit(message, coverage_stats)
+        _invalidate_status_cache()
         return {
             "success": result.success,
             "message": result.message,
@@ -230,6 +291,7 @@ def automated_workflow(
             pr_title,
             coverage_stats
         )
+        _invalidate_status_cache()
         return {"success": True, "workflow_steps": result}
     except Exception as e:
         return {
@@ -289,9 +351,6 @@ def create_and_commit(
     - `create_branch`: optional branch name to create and switch to before making changes.
     Returns a dict with step results.
     """
-    import datetime
-    from pathlib import Path
-
     try:
         # Optionally create/check out a feature branch
         if create_branch:
@@ -299,16 +358,16 @@ def create_and_commit(
             rc, out, err = git_automation._run_git(["checkout", "-b", create_branch])
             if rc != 0:
                 git_automation._run_git(["checkout", create_branch])
+            _invalidate_status_cache()
 
         # Prepare content
         if content is None:
-            content = f"autocommit: {datetime.datetime.utcnow().isoformat()}\n"
+            content = autocommit_line()
 
         # Write/append to file
         p = Path(file_path)
         p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("a", encoding="utf-8") as f:
-            f.write(content)
+        append_text(p, content)
 
         # Stage changes
         stage_result = git_add_all()
@@ -368,12 +427,16 @@ if __name__ == "__main__":
 
 
     # Start the MCP server in a background thread so we can run mvn after it starts
+    server_done = threading.Event()
+
     def _run_server():
         try:
             mcp.run(transport="sse", host="127.0.0.1", port=8001)
         except Exception:
             # if server stops due to an exception, print and exit thread
             print("ApleTest server stopped with an exception.")
+        finally:
+            server_done.set()
 
     server_thread = threading.Thread(target=_run_server, name="ApleTestServerThread", daemon=True)
     server_thread.start()
@@ -382,12 +445,6 @@ if __name__ == "__main__":
     
     # Wait for server thread to finish (server runs until interrupted)
     try:
-        while server_thread.is_alive():
-            server_thread.join(timeout=1.0)
-    except KeyboardInterrupt:
-        _graceful_shutdown()
-    try:
-        mcp.run(transport="sse", host="127.0.0.1", port=8001)
+        server_done.wait()
     except KeyboardInterrupt:
-        # fallback if signal didn't fire inside anyio
         _graceful_shutdown()
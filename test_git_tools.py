@@ -2,8 +2,11 @@
 """
 Quick test script to verify git tools are working correctly.
 Run this to validate the implementation before integrating with server.
+Pass --quiet to print only failing tests and the summary.
 """
 
+import contextlib
+import io
 import sys
 from git_tools import GitAutomation, WorkflowIntegration, GitToolsError
 
@@ -14,11 +17,11 @@ def print_section(title):
     print(f"{'='*60}\n")
 
 
-def test_git_status():
+def test_git_status(git=None):
     """Test git_status tool."""
     print_section("TEST 1: git_status()")
     try:
-        git = GitAutomation(".")
+        git = git or GitAutomation(".")
         status = git.git_status()
         
         print(f"Repository Status:")
@@ -49,11 +52,11 @@ def test_git_status():
         return False
 
 
-def test_git_add_all():
+def test_git_add_all(git=None):
     """Test git_add_all tool (dry run)."""
     print_section("TEST 2: git_add_all()")
     try:
-        git = GitAutomation(".")
+        git = git or GitAutomation(".")
         result = git.git_add_all()
         
         print(f"Staging Result:")
@@ -80,11 +83,11 @@ def test_git_add_all():
         return False
 
 
-def test_git_push_dryrun():
+def test_git_push_dryrun(git=None):
     """Test git_push (dry run - checks current branch only)."""
     print_section("TEST 3: git_push() - Check Current Branch")
     try:
-        git = GitAutomation(".")
+        git = git or GitAutomation(".")
         status = git.git_status()
         
         branch = status.current_branch
@@ -103,11 +106,12 @@ def test_git_push_dryrun():
         return False
 
 
-def test_workflow():
+def test_workflow(git=None):
     """Test WorkflowIntegration initialization."""
     print_section("TEST 4: WorkflowIntegration")
     try:
-        workflow = WorkflowIntegration(".")
+        git = git or GitAutomation(".")
+        workflow = WorkflowIntegration(".", git=git)
         
         print("WorkflowIntegration initialized")
         print(f"  Has git_automation: {hasattr(workflow, 'git')}")
@@ -152,8 +156,20 @@ def test_imports():
         return False
 
 
+def run_test(test, *args, quiet=False):
+    """Run one test, writing its report to stdout in a single write; quiet keeps only failures."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = test(*args)
+    if not (quiet and result):
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    return result
+
+
 def main():
     """Run all tests."""
+    quiet = "--quiet" in sys.argv[1:]
     print("\n" + "="*60)
     print("  GIT TOOLS - VALIDATION TEST SUITE")
     print("="*60)
@@ -161,11 +177,17 @@ def main():
     results = []
     
     # Run tests in order
-    results.append(("Module Imports", test_imports()))
-    results.append(("git_status()", test_git_status()))
-    results.append(("git_add_all()", test_git_add_all()))
-    results.append(("git_push() Check", test_git_push_dryrun()))
-    results.append(("WorkflowIntegration", test_workflow()))
+    results.append(("Module Imports", run_test(test_imports, quiet=quiet)))
+    try:
+        # One instance for every test: the repo is validated once, as in server.py
+        git = GitAutomation(".")
+    except GitToolsError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    results.append(("git_status()", run_test(test_git_status, git, quiet=quiet)))
+    results.append(("git_add_all()", run_test(test_git_add_all, git, quiet=quiet)))
+    results.append(("git_push() Check", run_test(test_git_push_dryrun, git, quiet=quiet)))
+    results.append(("WorkflowIntegration", run_test(test_workflow, git, quiet=quiet)))
     
     # Summary
     print_section("TEST SUMMARY")
@@ -14,18 +14,30 @@ import argparse
 import subprocess
 import sys
 import os
-import datetime
 import json
+from pathlib import Path
+
+# The shared helpers live in git_tools.py at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from git_tools import append_text, autocommit_line
+
+
+# Built once for every git call: no optional index locks on read-only commands,
+# and fail instead of waiting on a credential prompt nobody will answer.
+_GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
 
 
 def run(cmd):
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    return {"rc": p.returncode, "out": p.stdout, "err": p.stderr}
+    p = subprocess.run(cmd, capture_output=True, stdin=subprocess.DEVNULL, env=_GIT_ENV)
+    return {
+        "rc": p.returncode,
+        "out": p.stdout.decode("utf-8", "replace"),
+        "err": p.stderr.decode("utf-8", "replace"),
+    }
 
 
 def get_current_branch():
-    p = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
-    return p.stdout.strip()
+    return run(["git", "rev-parse", "--abbrev-ref", "HEAD"])["out"].strip()
 
 
 def main():
@@ -49,7 +61,7 @@ def main():
 
     # Prepare content
     if args.content is None:
-        args.content = f"autocommit: {datetime.datetime.utcnow().isoformat()}\n"
+        args.content = autocommit_line()
 
     # Ensure directory exists
     file_dir = os.path.dirname(args.file)
@@ -58,8 +70,7 @@ def main():
 
     # Append to file
     try:
-        with open(args.file, "a", encoding="utf-8") as f:
-            f.write(args.content)
+        append_text(args.file, args.content)
     except Exception as e:
         print(json.dumps({"success": False, "step": "write", "error": str(e)}))
         sys.exit(1)